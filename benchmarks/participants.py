@@ -0,0 +1,96 @@
+"""
+CPU and memory of update_network_metrics() per 1,000 participants, against
+the previous approach (walking raw dicts and calling Gauge.labels() per set).
+
+Payload decoding is excluded: both approaches get the same pre-decoded payloads.
+
+    python benchmarks/participants.py [participants] [nodes_per_participant] [cycles]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ["EXPORT_NETWORK_METRICS"] = "true"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prometheus_client import CollectorRegistry, Gauge
+
+from gonka_exporter.collectors import network
+
+
+def make_payload(participants: int, nodes: int) -> dict:
+    payload = {"active_participants": {"participants": [
+        {
+            "seed": {"participant": f"gonka1{'x' * 32}{i:06d}"},
+            "weight": i,
+            "ml_nodes": [{"ml_nodes": [
+                {"node_id": f"node{j}", "poc_weight": i * j} for j in range(nodes)
+            ]}],
+        }
+        for i in range(participants)
+    ]}}
+    # Round-trip through JSON so strings are not shared between payloads
+    return json.loads(json.dumps(payload))
+
+
+# Previous implementation, on its own registry
+_registry = CollectorRegistry()
+OLD_PARTICIPANT_WEIGHT = Gauge("old_participant_weight", "", ["participant"], registry=_registry)
+OLD_NODE_POC_WEIGHT = Gauge("old_node_poc_weight", "", ["participant", "node_id"], registry=_registry)
+
+
+def old_update(data: dict):
+    participants = data.get("active_participants", {}).get("participants", [])
+    for participant in participants:
+        address = participant.get("seed", {}).get("participant")
+        weight = participant.get("weight")
+        if address and weight is not None:
+            OLD_PARTICIPANT_WEIGHT.labels(participant=address).set(weight)
+        for group in participant.get("ml_nodes", []):
+            for node in group.get("ml_nodes", []):
+                node_id = node.get("node_id")
+                poc_weight = node.get("poc_weight")
+                if address and node_id and poc_weight is not None:
+                    OLD_NODE_POC_WEIGHT.labels(participant=address, node_id=node_id).set(poc_weight)
+
+
+def new_update(data: dict):
+    network.fetch_participants = lambda: data
+    network.update_network_metrics()
+
+
+def measure(update, payloads):
+    # First cycle creates every labelled child; later cycles are steady state
+    update(payloads[0])
+    
+    start = time.perf_counter()
+    for data in payloads[1:]:
+        update(data)
+    cpu = (time.perf_counter() - start) / (len(payloads) - 1)
+    
+    tracemalloc.start()
+    for data in payloads[1:]:
+        update(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, peak
+
+
+def main():
+    participants = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    nodes = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    cycles = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    payloads = [make_payload(participants, nodes) for _ in range(cycles + 1)]
+    scale = 1000 / participants
+    
+    print(f"{participants} participants x {nodes} nodes, {cycles} cycles (per 1,000 participants)")
+    print(f"{'approach':<10} {'ms/cycle':>10} {'peak KiB/cycle':>15}")
+    for name, update in (("old", old_update), ("new", new_update)):
+        cpu, peak = measure(update, payloads)
+        print(f"{name:<10} {cpu * 1000 * scale:>10.2f} {peak / 1024 * scale:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Startup time and memory per deployment profile.
+
+Each profile runs in a fresh interpreter that imports exporter.py and loads
+its enabled collectors, without starting the HTTP server or fetching anything.
+
+    python benchmarks/startup.py [repeats]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILES = {
+    "local-node": {
+        "EXPORT_NETWORK_METRICS": "false",
+        "ENABLE_NODE_FETCH": "true",
+        "PARTICIPANT_ADDRESS": "",
+    },
+    "local-node+participant": {
+        "EXPORT_NETWORK_METRICS": "false",
+        "ENABLE_NODE_FETCH": "true",
+        "PARTICIPANT_ADDRESS": "gonka1benchmark",
+    },
+    "central-network": {
+        "EXPORT_NETWORK_METRICS": "true",
+        "ENABLE_NODE_FETCH": "false",
+        "PARTICIPANT_ADDRESS": "gonka1benchmark",
+    },
+    "combined": {
+        "EXPORT_NETWORK_METRICS": "true",
+        "ENABLE_NODE_FETCH": "true",
+        "PARTICIPANT_ADDRESS": "gonka1benchmark",
+    },
+}
+
+PROBE = """
+import resource, sys, time
+start = time.perf_counter()
+import exporter
+exporter.load_collectors()
+elapsed = time.perf_counter() - start
+from prometheus_client import REGISTRY
+families = sum(1 for f in REGISTRY.collect() if f.name.startswith("gonka_"))
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, families)
+"""
+
+
+def run_profile(env_overrides, repeats):
+    env = dict(os.environ, **env_overrides)
+    times, rss = [], []
+    families = 0
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            cwd=REPO_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        times.append(float(out[0]))
+        rss.append(int(out[1]))
+        families = int(out[2])
+    return statistics.median(times), statistics.median(rss), families
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'profile':<24} {'startup ms':>10} {'max RSS MiB':>12} {'families':>9}")
+    for name, env_overrides in PROFILES.items():
+        elapsed, rss_kib, families = run_profile(env_overrides, repeats)
+        print(f"{name:<24} {elapsed * 1000:>10.1f} {rss_kib / 1024:>12.1f} {families:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Gonka Prometheus exporter internals. exporter.py is the entry point.
+"""
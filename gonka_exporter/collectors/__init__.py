@@ -0,0 +1,47 @@
+"""
+Collectors, one module per metric group. A collector's module is imported,
+and its metrics registered, only when the collector is enabled.
+"""
+import importlib
+from typing import Callable, List, Tuple
+
+from gonka_exporter.config import (
+    ENABLE_NODE_FETCH,
+    EXPORT_ALL_PARTICIPANT_STATS,
+    EXPORT_NETWORK_METRICS,
+    PARTICIPANT_ADDRESS,
+)
+
+# (name, module, update function, enabled), highest priority first:
+# block height, local nodes, your participant, network-wide, pricing/models.
+# Rotating all-participant stats go after everything else and only use
+# whatever budget is left, since they catch up over later cycles anyway;
+# their ages are refreshed every cycle regardless.
+# The network collector also feeds the participant list for all_participants.
+COLLECTORS = [
+    ("tendermint", "tendermint", "update_tendermint_metrics", True),
+    ("nodes", "nodes", "update_node_metrics", ENABLE_NODE_FETCH),
+    ("participant", "participant", "update_participant_metrics", bool(PARTICIPANT_ADDRESS)),
+    ("network", "network", "update_network_metrics", EXPORT_NETWORK_METRICS),
+    ("pricing", "pricing", "update_pricing_metrics", EXPORT_NETWORK_METRICS),
+    ("models", "models", "update_model_metrics", EXPORT_NETWORK_METRICS),
+    ("all_participants", "participant", "update_all_participant_metrics", EXPORT_NETWORK_METRICS and EXPORT_ALL_PARTICIPANT_STATS),
+    ("participant_stats_age", "participant", "update_participant_stats_age", EXPORT_NETWORK_METRICS and EXPORT_ALL_PARTICIPANT_STATS),
+]
+
+# Collectors that make no upstream requests, and so are never deferred
+LOCAL_COLLECTORS = {"participant_stats_age"}
+
+
+def load_collectors() -> List[Tuple[str, Callable[[], None]]]:
+    """
+    Import the modules of enabled collectors, registering their metrics.
+    Returns (name, update function) pairs in priority order.
+    """
+    loaded = []
+    for name, module_name, function_name, enabled in COLLECTORS:
+        if not enabled:
+            continue
+        module = importlib.import_module(f"{__name__}.{module_name}")
+        loaded.append((name, getattr(module, function_name)))
+    return loaded
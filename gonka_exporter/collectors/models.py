@@ -0,0 +1,90 @@
+"""
+Model information metrics (EXPORT_NETWORK_METRICS only).
+"""
+from typing import Any, Dict, Optional
+
+from prometheus_client import Gauge
+
+from gonka_exporter.config import EXPORT_NETWORK_METRICS, MODELS_ENDPOINT
+from gonka_exporter.upstream import network_api_get
+
+# =============================================================================
+# PROMETHEUS METRICS
+# =============================================================================
+
+MODEL_V_RAM = Gauge(
+    "gonka_model_v_ram",
+    "VRAM requirement for each model in GB",
+    ["model_id"]
+)
+
+MODEL_THROUGHPUT = Gauge(
+    "gonka_model_throughput_per_nonce",
+    "Throughput per nonce for each model",
+    ["model_id"]
+)
+
+MODEL_VALIDATION_THRESHOLD = Gauge(
+    "gonka_model_validation_threshold",
+    "Validation threshold (value * 10^exponent)",
+    ["model_id"]
+)
+
+# =============================================================================
+# FETCH FUNCTIONS
+# =============================================================================
+
+def fetch_models() -> Optional[Dict[str, Any]]:
+    """
+    Fetch models data from the network API.
+    Returns parsed JSON or None on failure.
+    """
+    try:
+        response = network_api_get(MODELS_ENDPOINT, timeout=10)
+        return response.json()
+    except Exception as exc:
+        print(f"[ERROR] Failed to fetch models from network API: {exc}")
+        return None
+
+# =============================================================================
+# UPDATE FUNCTIONS
+# =============================================================================
+
+def update_model_metrics():
+    """
+    Update model information metrics.
+    Always uses localhost:8000 to reduce load on external nodes.
+    Only runs if EXPORT_NETWORK_METRICS is enabled.
+    """
+    if not EXPORT_NETWORK_METRICS:
+        return
+    
+    models = fetch_models()
+    if not models:
+        return
+    
+    for model in models.get("models", []):
+        model_id = model.get("id")
+        if not model_id:
+            continue
+        
+        # VRAM
+        v_ram = model.get("v_ram")
+        if v_ram is not None:
+            MODEL_V_RAM.labels(model_id=model_id).set(v_ram)
+        
+        # Throughput
+        throughput = model.get("throughput_per_nonce")
+        if throughput is not None:
+            MODEL_THROUGHPUT.labels(model_id=model_id).set(throughput)
+        
+        # Validation threshold
+        vt = model.get("validation_threshold", {})
+        val_value = vt.get("value")
+        val_exponent = vt.get("exponent")
+        if val_value is not None and val_exponent is not None:
+            try:
+                combined = float(val_value) * (10 ** int(val_exponent))
+                MODEL_VALIDATION_THRESHOLD.labels(model_id=model_id).set(combined)
+            except Exception:
+                pass
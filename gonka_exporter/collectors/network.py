@@ -0,0 +1,139 @@
+"""
+Network-wide participant weights (EXPORT_NETWORK_METRICS only).
+"""
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from prometheus_client import Gauge
+
+from gonka_exporter.config import EXPORT_NETWORK_METRICS, PARTICIPANTS_ENDPOINT
+from gonka_exporter.labels import labelled
+from gonka_exporter.upstream import network_api_get
+
+# =============================================================================
+# PROMETHEUS METRICS
+# =============================================================================
+
+NETWORK_PARTICIPANT_WEIGHT = Gauge(
+    "gonka_network_participant_weight",
+    "Weight of each participant in the network",
+    ["participant"]
+)
+
+NETWORK_NODE_POC_WEIGHT = Gauge(
+    "gonka_network_node_poc_weight",
+    "PoC weight of a node across the network",
+    ["participant", "node_id"]
+)
+
+# =============================================================================
+# PARSED PAYLOADS
+# =============================================================================
+
+class ParticipantRecord:
+    """
+    Compact view of one entry from the participants endpoint.
+    Address and node IDs are interned so repeated cycles share one string.
+    """
+    __slots__ = ("address", "weight", "node_ids", "node_poc_weights")
+
+    def __init__(self, address: str, weight: Optional[float], node_ids: Tuple[str, ...], node_poc_weights: array):
+        self.address = address
+        self.weight = weight
+        self.node_ids = node_ids
+        self.node_poc_weights = node_poc_weights
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except Exception:
+        return None
+
+
+def parse_participants(data: Dict[str, Any]) -> Iterator[ParticipantRecord]:
+    """
+    Parse the participants payload into ParticipantRecords, lazily.
+    Entries without an address are skipped, as are nodes without an ID or a
+    numeric PoC weight. Numeric strings are accepted, as Gauge.set() would.
+    """
+    for participant in data.get("active_participants", {}).get("participants", []):
+        address = participant.get("seed", {}).get("participant")
+        if not address:
+            continue
+        
+        node_ids = []
+        node_poc_weights = array("d")
+        for group in participant.get("ml_nodes", []):
+            for node in group.get("ml_nodes", []):
+                node_id = node.get("node_id")
+                poc_weight = _to_float(node.get("poc_weight"))
+                if node_id and poc_weight is not None:
+                    node_ids.append(sys.intern(node_id))
+                    node_poc_weights.append(poc_weight)
+        
+        yield ParticipantRecord(
+            sys.intern(address),
+            _to_float(participant.get("weight")),
+            tuple(node_ids),
+            node_poc_weights,
+        )
+
+# =============================================================================
+# COLLECTION STATE
+# =============================================================================
+
+# Active participant addresses from the latest participants fetch
+active_participants: List[str] = []
+
+# =============================================================================
+# FETCH FUNCTIONS
+# =============================================================================
+
+def fetch_participants() -> Optional[Dict[str, Any]]:
+    """
+    Fetch participants data from the network API.
+    Returns parsed JSON or None on failure.
+    """
+    try:
+        response = network_api_get(PARTICIPANTS_ENDPOINT, timeout=10)
+        return response.json()
+    except Exception as exc:
+        print(f"[ERROR] Failed to fetch participants from network API: {exc}")
+        return None
+
+# =============================================================================
+# UPDATE FUNCTIONS
+# =============================================================================
+
+def update_network_metrics():
+    """
+    Update network-wide metrics (participants across entire network).
+    Always uses localhost:8000 to reduce load on external nodes.
+    Only runs if EXPORT_NETWORK_METRICS is enabled.
+    """
+    global active_participants
+
+    if not EXPORT_NETWORK_METRICS:
+        return
+    
+    data = fetch_participants()
+    if not data:
+        return
+    
+    addresses = []
+    
+    for record in parse_participants(data):
+        addresses.append(record.address)
+        
+        if record.weight is not None:
+            labelled(NETWORK_PARTICIPANT_WEIGHT, record.address).set(record.weight)
+        
+        # Network-wide node PoC weights
+        for node_id, poc_weight in zip(record.node_ids, record.node_poc_weights):
+            labelled(NETWORK_NODE_POC_WEIGHT, record.address, node_id).set(poc_weight)
+
+    active_participants = addresses
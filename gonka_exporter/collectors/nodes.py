@@ -0,0 +1,349 @@
+"""
+Local node status, PoC weights and GPU stats from the admin API (ENABLE_NODE_FETCH),
+with adaptive polling of node state between cycles.
+"""
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from gonka_exporter.config import (
+    ENABLE_NODE_FETCH,
+    HARDWARE_NODE_STATUS_MAP,
+    NODE_BASE_URL,
+    NODE_FAST_POLL_INTERVAL,
+    POC_STATUS_MAP,
+    REFRESH_INTERVAL,
+)
+from gonka_exporter.labels import labelled
+from gonka_exporter.upstream import UpstreamThrottled, upstream_get
+
+# =============================================================================
+# PROMETHEUS METRICS
+# =============================================================================
+
+NODE_STATUS = Gauge(
+    "gonka_node_status",
+    "Node status (0=other, 1=INFERENCE, 2=POC, 3=TRAINING, 4=STOPPED, 5=FAILED)",
+    ["node_id", "host"]
+)
+
+NODE_POC_WEIGHT = Gauge(
+    "gonka_node_poc_weight",
+    "POC weight per node",
+    ["node_id", "host", "model"]
+)
+
+NODE_INTENDED_STATUS = Gauge(
+    "gonka_node_intended_status",
+    "Intended status of node (target state)",
+    ["node_id", "host"]
+)
+
+NODE_POC_CURRENT_STATUS = Gauge(
+    "gonka_node_poc_current_status",
+    "Current POC status (0=IDLE, 1=GENERATING, 2=VALIDATING)",
+    ["node_id", "host"]
+)
+
+NODE_POC_INTENDED_STATUS = Gauge(
+    "gonka_node_poc_intended_status",
+    "Intended POC status (target state)",
+    ["node_id", "host"]
+)
+
+NODE_GPU_DEVICE_COUNT = Gauge(
+    "gonka_node_gpu_device_count",
+    "Number of GPU devices on node",
+    ["node_id", "host"]
+)
+
+NODE_GPU_AVG_UTILIZATION = Gauge(
+    "gonka_node_gpu_avg_utilization_percent",
+    "Average GPU utilization percent across all devices",
+    ["node_id", "host"]
+)
+
+NODE_POC_TIMESLOT_ASSIGNED = Gauge(
+    "gonka_node_poc_timeslot_assigned",
+    "Whether node was chosen to serve inferences during PoC (1=assigned, 0=not assigned)",
+    ["node_id", "host", "model"]
+)
+
+NODE_STATUS_TRANSITIONS = Counter(
+    "gonka_node_status_transitions_total",
+    "Observed node status transitions",
+    ["node_id", "host", "from_status", "to_status"]
+)
+
+NODE_POC_STATUS_TRANSITIONS = Counter(
+    "gonka_node_poc_status_transitions_total",
+    "Observed PoC status transitions",
+    ["node_id", "host", "from_status", "to_status"]
+)
+
+NODE_STATUS_SECONDS = Counter(
+    "gonka_node_status_seconds_total",
+    "Time spent in each node status, as observed by polling",
+    ["node_id", "host", "status"]
+)
+
+NODE_POC_STATUS_SECONDS = Counter(
+    "gonka_node_poc_status_seconds_total",
+    "Time spent in each PoC status, as observed by polling",
+    ["node_id", "host", "status"]
+)
+
+NODE_STATUS_DURATION = Gauge(
+    "gonka_node_status_duration_seconds",
+    "Seconds the node has been in its current status and PoC status",
+    ["node_id", "host"]
+)
+
+# =============================================================================
+# COLLECTION STATE
+# =============================================================================
+
+class NodeStateRecord:
+    """
+    Last observed status of one local node, for transition and time-in-state tracking.
+    Times are time.monotonic() values.
+    """
+    __slots__ = ("status", "poc_status", "since", "observed")
+
+    def __init__(self, status: str, poc_status: str, now: float):
+        self.status = status
+        self.poc_status = poc_status
+        self.since = now
+        self.observed = now
+
+
+# Node state by (node_id, host)
+_node_states: Dict[Tuple[str, str], NodeStateRecord] = {}
+
+# Delay before the next node state poll between full cycles
+_node_poll_interval = float(REFRESH_INTERVAL)
+
+# =============================================================================
+# FETCH FUNCTIONS
+# =============================================================================
+
+def fetch_nodes(budgeted: bool = True) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fetch list of nodes from admin API.
+    Returns list of node dicts, empty list on failure, or None if the
+    request was throttled (nothing is known about the nodes either way).
+    """
+    url = f"{NODE_BASE_URL}/nodes"
+    try:
+        response = upstream_get(url, timeout=10, budgeted=budgeted)
+        response.raise_for_status()
+        return response.json()
+    except UpstreamThrottled as exc:
+        print(f"[WARN] Skipped fetching nodes from {url}: {exc}")
+        return None
+    except Exception as exc:
+        print(f"[ERROR] Failed to fetch nodes from {url}: {exc}")
+        return []
+
+
+def fetch_gpu_stats(host: str, port: int) -> Optional[Tuple[int, float]]:
+    """
+    Fetch GPU device statistics from a node.
+    Returns (device_count, avg_utilization_percent).
+    On error, returns (0, 0.0); if throttled, returns None.
+    """
+    api_version = "v3.0.8"
+    url = f"http://{host}:{port}/{api_version}/api/v1/gpu/devices"
+    try:
+        response = upstream_get(url, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        devices = data.get("devices", [])
+        count = len(devices)
+        if count == 0:
+            return 0, 0.0
+        total_util = sum(d.get("utilization_percent", 0) for d in devices if isinstance(d, dict))
+        avg_util = total_util / count
+        return count, avg_util
+    except UpstreamThrottled as exc:
+        print(f"[WARN] Skipped fetching GPU stats from {url}: {exc}")
+        return None
+    except Exception as exc:
+        print(f"[ERROR] Failed to fetch GPU stats from {url}: {exc}")
+        return 0, 0.0
+
+# =============================================================================
+# UPDATE FUNCTIONS
+# =============================================================================
+
+def export_node_state(node_id: str, node_host: str, state: Dict[str, Any], now: float) -> bool:
+    """
+    Set node status gauges and record transitions and time in state.
+    Returns True if the node is in POC, mid-transition, or just changed status.
+    """
+    # Current status
+    current_status = state.get("current_status", "").upper()
+    status_value = HARDWARE_NODE_STATUS_MAP.get(current_status, 0)
+    labelled(NODE_STATUS, node_id, node_host).set(status_value)
+    
+    # Intended status
+    intended_status = state.get("intended_status", "").upper()
+    if intended_status:
+        intended_value = HARDWARE_NODE_STATUS_MAP.get(intended_status, 0)
+        labelled(NODE_INTENDED_STATUS, node_id, node_host).set(intended_value)
+    
+    # PoC current status
+    poc_status = state.get("poc_current_status", "").upper()
+    poc_value = POC_STATUS_MAP.get(poc_status, 0)
+    labelled(NODE_POC_CURRENT_STATUS, node_id, node_host).set(poc_value)
+    
+    # PoC intended status
+    poc_intended = state.get("poc_intended_status", "").upper()
+    if poc_intended:
+        poc_intended_value = POC_STATUS_MAP.get(poc_intended, 0)
+        labelled(NODE_POC_INTENDED_STATUS, node_id, node_host).set(poc_intended_value)
+    
+    # Transitions and time in state, with label values limited to known enums
+    status_name = current_status if current_status in HARDWARE_NODE_STATUS_MAP else "UNKNOWN"
+    poc_name = poc_status if poc_status in POC_STATUS_MAP else "IDLE"
+    key = (node_id, node_host)
+    record = _node_states.get(key)
+    changed = False
+    if record is None:
+        record = _node_states[key] = NodeStateRecord(status_name, poc_name, now)
+    else:
+        elapsed = now - record.observed
+        labelled(NODE_STATUS_SECONDS, node_id, node_host, record.status).inc(elapsed)
+        labelled(NODE_POC_STATUS_SECONDS, node_id, node_host, record.poc_status).inc(elapsed)
+        if status_name != record.status:
+            labelled(NODE_STATUS_TRANSITIONS, node_id, node_host, record.status, status_name).inc()
+            changed = True
+        if poc_name != record.poc_status:
+            labelled(NODE_POC_STATUS_TRANSITIONS, node_id, node_host, record.poc_status, poc_name).inc()
+            changed = True
+        if changed:
+            record.status = status_name
+            record.poc_status = poc_name
+            record.since = now
+        record.observed = now
+    labelled(NODE_STATUS_DURATION, node_id, node_host).set(now - record.since)
+    
+    return (
+        changed
+        or status_name == "POC"
+        or poc_name != "IDLE"
+        or bool(intended_status and intended_status != current_status)
+        or bool(poc_intended and poc_intended != poc_status)
+    )
+
+
+def adjust_node_poll_interval(unsettled: bool):
+    """
+    Poll fast while any node is unsettled, otherwise double the delay up to REFRESH_INTERVAL.
+    """
+    global _node_poll_interval
+
+    if unsettled and NODE_FAST_POLL_INTERVAL > 0:
+        _node_poll_interval = NODE_FAST_POLL_INTERVAL
+    else:
+        _node_poll_interval = min(_node_poll_interval * 2, float(REFRESH_INTERVAL))
+
+
+def poll_node_state():
+    """
+    Refresh node status metrics only (no PoC weights or GPU stats).
+    Used between full cycles while node state is changing, outside the
+    cycle's request budget.
+    """
+    nodes = fetch_nodes(budgeted=False)
+    if nodes is None:
+        # Throttled: keep the current interval and try again on the next poll
+        return
+    if not nodes:
+        adjust_node_poll_interval(False)
+        return
+    
+    now = time.monotonic()
+    unsettled = False
+    for entry in nodes:
+        node_info = entry.get("node", {})
+        if export_node_state(node_info.get("id", "unknown"), node_info.get("host", "unknown"), entry.get("state", {}), now):
+            unsettled = True
+    
+    adjust_node_poll_interval(unsettled)
+
+
+def wait_for_next_cycle():
+    """
+    Sleep REFRESH_INTERVAL, polling node state in between while it is changing.
+    """
+    deadline = time.monotonic() + REFRESH_INTERVAL
+    while True:
+        remaining = deadline - time.monotonic()
+        adaptive = ENABLE_NODE_FETCH and NODE_FAST_POLL_INTERVAL > 0
+        if not adaptive or _node_poll_interval >= remaining:
+            time.sleep(max(0.0, remaining))
+            return
+        time.sleep(_node_poll_interval)
+        poll_node_state()
+
+
+def update_node_metrics():
+    """
+    Update node-specific metrics (YOUR local nodes).
+    Only runs if ENABLE_NODE_FETCH is true.
+    """
+    if not ENABLE_NODE_FETCH:
+        return
+    
+    nodes = fetch_nodes()
+    if not nodes:
+        return
+    
+    now = time.monotonic()
+    unsettled = False
+    
+    for entry in nodes:
+        node_info = entry.get("node", {})
+        node_id = node_info.get("id", "unknown")
+        node_host = node_info.get("host", "unknown")
+        node_port = node_info.get("poc_port")
+        
+        state = entry.get("state", {})
+        
+        if export_node_state(node_id, node_host, state, now):
+            unsettled = True
+        
+        # PoC weight per model and timeslot allocation
+        epoch_ml_nodes = state.get("epoch_ml_nodes", {})
+        for model, model_data in epoch_ml_nodes.items():
+            if isinstance(model_data, dict):
+                poc_weight = model_data.get("poc_weight")
+                if poc_weight is not None:
+                    NODE_POC_WEIGHT.labels(
+                        node_id=node_id,
+                        host=node_host,
+                        model=model
+                    ).set(poc_weight)
+
+                # Timeslot allocation - second boolean indicates if node serves inferences during PoC
+                timeslot_allocation = model_data.get("timeslot_allocation", [])
+                if isinstance(timeslot_allocation, list) and len(timeslot_allocation) >= 2:
+                    poc_assigned = timeslot_allocation[1]
+                    NODE_POC_TIMESLOT_ASSIGNED.labels(
+                        node_id=node_id,
+                        host=node_host,
+                        model=model
+                    ).set(1 if poc_assigned else 0)
+
+        # GPU stats
+        if node_port and node_host:
+            gpu_stats = fetch_gpu_stats(node_host, node_port)
+            # Throttled: keep the last values rather than report 0 GPUs
+            if gpu_stats is not None:
+                gpu_count, gpu_avg_util = gpu_stats
+                NODE_GPU_DEVICE_COUNT.labels(node_id=node_id, host=node_host).set(gpu_count)
+                NODE_GPU_AVG_UTILIZATION.labels(node_id=node_id, host=node_host).set(gpu_avg_util)
+    
+    adjust_node_poll_interval(unsettled)
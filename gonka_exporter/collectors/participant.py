@@ -0,0 +1,257 @@
+"""
+Detailed participant stats: PARTICIPANT_ADDRESS every cycle, and all active
+participants round-robin with EXPORT_ALL_PARTICIPANT_STATS.
+"""
+import time
+from bisect import bisect_right
+from typing import Any, Dict, Optional
+
+from prometheus_client import Gauge
+
+from gonka_exporter.config import (
+    EXPORT_ALL_PARTICIPANT_STATS,
+    EXPORT_NETWORK_METRICS,
+    PARTICIPANT_ADDRESS,
+    PARTICIPANT_STATS_BATCH_SIZE,
+    PARTICIPANT_STATS_ENDPOINT,
+)
+from gonka_exporter.labels import labelled, remove_labelled
+from gonka_exporter.upstream import network_api_get, request_budget_remaining
+
+# =============================================================================
+# PROMETHEUS METRICS
+# =============================================================================
+
+PARTICIPANT_EPOCHS_COMPLETED = Gauge(
+    "gonka_participant_epochs_completed",
+    "Number of epochs completed by participant",
+    ["participant"]
+)
+
+PARTICIPANT_COIN_BALANCE = Gauge(
+    "gonka_participant_coin_balance",
+    "Coin balance of participant",
+    ["participant"]
+)
+
+PARTICIPANT_INFERENCE_COUNT = Gauge(
+    "gonka_participant_inference_count",
+    "Inference count for participant in current epoch",
+    ["participant"]
+)
+
+PARTICIPANT_MISSED_REQUESTS = Gauge(
+    "gonka_participant_missed_requests",
+    "Missed requests for participant in current epoch",
+    ["participant"]
+)
+
+PARTICIPANT_EARNED_COINS = Gauge(
+    "gonka_participant_earned_coins",
+    "Earned coins for participant in current epoch",
+    ["participant"]
+)
+
+PARTICIPANT_VALIDATED_INFERENCES = Gauge(
+    "gonka_participant_validated_inferences",
+    "Validated inferences for participant in current epoch",
+    ["participant"]
+)
+
+PARTICIPANT_INVALIDATED_INFERENCES = Gauge(
+    "gonka_participant_invalidated_inferences",
+    "Invalidated inferences for participant in current epoch",
+    ["participant"]
+)
+
+PARTICIPANT_STATS_AGE = Gauge(
+    "gonka_participant_stats_age_seconds",
+    "Seconds since detailed stats for participant were last refreshed",
+    ["participant"]
+)
+
+# Per-participant stat gauges, cleared together when a participant leaves
+PARTICIPANT_STATS_GAUGES = [
+    PARTICIPANT_EPOCHS_COMPLETED,
+    PARTICIPANT_COIN_BALANCE,
+    PARTICIPANT_INFERENCE_COUNT,
+    PARTICIPANT_MISSED_REQUESTS,
+    PARTICIPANT_EARNED_COINS,
+    PARTICIPANT_VALIDATED_INFERENCES,
+    PARTICIPANT_INVALIDATED_INFERENCES,
+    PARTICIPANT_STATS_AGE,
+]
+
+# =============================================================================
+# PARSED PAYLOADS
+# =============================================================================
+
+class ParticipantStatsRecord:
+    """
+    Compact view of a participant stats payload.
+    Fields are None when missing or not parseable as int.
+    """
+    __slots__ = (
+        "epochs_completed",
+        "coin_balance",
+        "inference_count",
+        "missed_requests",
+        "earned_coins",
+        "validated_inferences",
+        "invalidated_inferences",
+    )
+
+    def __init__(self, **fields: Optional[int]):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+
+def _to_int(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except Exception:
+        return None
+
+
+def parse_participant_stats(p_data: Dict[str, Any]) -> ParticipantStatsRecord:
+    """
+    Parse a participant stats payload into a ParticipantStatsRecord.
+    """
+    participant = p_data.get("participant", {})
+    epoch_stats = participant.get("current_epoch_stats", {})
+    return ParticipantStatsRecord(
+        epochs_completed=_to_int(participant.get("epochs_completed")),
+        coin_balance=_to_int(participant.get("coin_balance")),
+        inference_count=_to_int(epoch_stats.get("inference_count")),
+        missed_requests=_to_int(epoch_stats.get("missed_requests")),
+        earned_coins=_to_int(epoch_stats.get("earned_coins")),
+        validated_inferences=_to_int(epoch_stats.get("validated_inferences")),
+        invalidated_inferences=_to_int(epoch_stats.get("invalidated_inferences")),
+    )
+
+# =============================================================================
+# COLLECTION STATE
+# =============================================================================
+
+# Last address fetched in the round-robin over sorted active participants
+# ("" = start from the beginning)
+_participant_stats_cursor = ""
+
+# Last successful detailed stats refresh per participant (unix timestamp)
+_participant_stats_refreshed: Dict[str, float] = {}
+
+# =============================================================================
+# FETCH FUNCTIONS
+# =============================================================================
+
+def fetch_participant_stats(address: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch detailed stats for a specific participant from the network API.
+    Returns parsed JSON or None on failure.
+    """
+    try:
+        response = network_api_get(f"{PARTICIPANT_STATS_ENDPOINT}/{address}", timeout=10)
+        return response.json()
+    except Exception as exc:
+        print(f"[ERROR] Failed to fetch participant stats for {address}: {exc}")
+        return None
+
+# =============================================================================
+# UPDATE FUNCTIONS
+# =============================================================================
+
+def export_participant_stats(address: str, p_data: Dict[str, Any]):
+    """
+    Set participant stat gauges for one address from a participant stats payload.
+    """
+    stats = parse_participant_stats(p_data)
+    
+    for gauge, value in (
+        (PARTICIPANT_EPOCHS_COMPLETED, stats.epochs_completed),
+        (PARTICIPANT_COIN_BALANCE, stats.coin_balance),
+        (PARTICIPANT_INFERENCE_COUNT, stats.inference_count),
+        (PARTICIPANT_MISSED_REQUESTS, stats.missed_requests),
+        (PARTICIPANT_EARNED_COINS, stats.earned_coins),
+        (PARTICIPANT_VALIDATED_INFERENCES, stats.validated_inferences),
+        (PARTICIPANT_INVALIDATED_INFERENCES, stats.invalidated_inferences),
+    ):
+        if value is not None:
+            labelled(gauge, address).set(value)
+    
+    _participant_stats_refreshed[address] = time.time()
+
+
+def update_participant_metrics():
+    """
+    Update participant-specific metrics (for YOUR address only).
+    Always uses localhost:8000 to reduce load on external nodes.
+    Only runs if PARTICIPANT_ADDRESS is set.
+    """
+    if not PARTICIPANT_ADDRESS:
+        return
+    
+    p_data = fetch_participant_stats(PARTICIPANT_ADDRESS)
+    if not p_data or not isinstance(p_data, dict):
+        return
+    
+    export_participant_stats(PARTICIPANT_ADDRESS, p_data)
+
+
+def update_all_participant_metrics():
+    """
+    Update detailed stats for all active participants, round-robin.
+    Each cycle fetches stats for the next PARTICIPANT_STATS_BATCH_SIZE
+    participants only, so load on localhost:8000 is bounded per cycle.
+    Only runs if EXPORT_NETWORK_METRICS and EXPORT_ALL_PARTICIPANT_STATS are enabled.
+    """
+    global _participant_stats_cursor
+
+    if not (EXPORT_NETWORK_METRICS and EXPORT_ALL_PARTICIPANT_STATS):
+        return
+    
+    # Participant list comes from the network collector, which runs first
+    from gonka_exporter.collectors import network
+    
+    # PARTICIPANT_ADDRESS is refreshed every cycle by update_participant_metrics
+    addresses = sorted(a for a in network.active_participants if a != PARTICIPANT_ADDRESS)
+    
+    if addresses:
+        # Resume after the last address fetched; by address rather than index,
+        # so participants joining or leaving don't shift the rotation
+        start = bisect_right(addresses, _participant_stats_cursor) % len(addresses)
+        batch_size = min(PARTICIPANT_STATS_BATCH_SIZE, len(addresses))
+        remaining = request_budget_remaining()
+        if remaining is not None:
+            batch_size = min(batch_size, remaining)
+        for i in range(batch_size):
+            address = addresses[(start + i) % len(addresses)]
+            p_data = fetch_participant_stats(address)
+            if p_data and isinstance(p_data, dict):
+                export_participant_stats(address, p_data)
+            _participant_stats_cursor = address
+
+
+def update_participant_stats_age():
+    """
+    Drop stats of participants that left the active set and refresh
+    gonka_participant_stats_age_seconds. Makes no upstream requests, so it
+    runs every cycle, even when update_all_participant_metrics is deferred.
+    """
+    if not (EXPORT_NETWORK_METRICS and EXPORT_ALL_PARTICIPANT_STATS):
+        return
+    
+    from gonka_exporter.collectors import network
+    
+    # Drop participants that left the active set
+    active = set(network.active_participants)
+    for address in list(_participant_stats_refreshed):
+        if address not in active and address != PARTICIPANT_ADDRESS:
+            del _participant_stats_refreshed[address]
+            for gauge in PARTICIPANT_STATS_GAUGES:
+                remove_labelled(gauge, address)
+    
+    now = time.time()
+    for address, refreshed in _participant_stats_refreshed.items():
+        labelled(PARTICIPANT_STATS_AGE, address).set(now - refreshed)
@@ -0,0 +1,92 @@
+"""
+Pricing metrics (EXPORT_NETWORK_METRICS only).
+"""
+from typing import Any, Dict, Optional
+
+from prometheus_client import Gauge
+
+from gonka_exporter.config import EXPORT_NETWORK_METRICS, PRICING_ENDPOINT
+from gonka_exporter.upstream import network_api_get
+
+# =============================================================================
+# PROMETHEUS METRICS
+# =============================================================================
+
+PRICING_UNIT_OF_COMPUTE_PRICE = Gauge(
+    "gonka_pricing_unit_of_compute_price",
+    "Unit of compute price from pricing endpoint"
+)
+
+PRICING_DYNAMIC_ENABLED = Gauge(
+    "gonka_pricing_dynamic_enabled",
+    "Dynamic pricing enabled flag (1 = true, 0 = false)"
+)
+
+PRICING_MODEL_PRICE = Gauge(
+    "gonka_pricing_model_price_per_token",
+    "Price per token for each model",
+    ["model_id"]
+)
+
+PRICING_MODEL_UNITS = Gauge(
+    "gonka_pricing_model_units_per_token",
+    "Units of compute per token for each model",
+    ["model_id"]
+)
+
+# =============================================================================
+# FETCH FUNCTIONS
+# =============================================================================
+
+def fetch_pricing() -> Optional[Dict[str, Any]]:
+    """
+    Fetch pricing data from the network API.
+    Returns parsed JSON or None on failure.
+    """
+    try:
+        response = network_api_get(PRICING_ENDPOINT, timeout=10)
+        return response.json()
+    except Exception as exc:
+        print(f"[ERROR] Failed to fetch pricing from network API: {exc}")
+        return None
+
+# =============================================================================
+# UPDATE FUNCTIONS
+# =============================================================================
+
+def update_pricing_metrics():
+    """
+    Update pricing metrics.
+    Always uses localhost:8000 to reduce load on external nodes.
+    Only runs if EXPORT_NETWORK_METRICS is enabled.
+    """
+    if not EXPORT_NETWORK_METRICS:
+        return
+    
+    pricing = fetch_pricing()
+    if not pricing:
+        return
+    
+    # Unit price
+    unit_price = pricing.get("unit_of_compute_price")
+    if unit_price is not None:
+        PRICING_UNIT_OF_COMPUTE_PRICE.set(unit_price)
+    
+    # Dynamic pricing flag
+    dynamic_enabled = pricing.get("dynamic_pricing_enabled")
+    if dynamic_enabled is not None:
+        PRICING_DYNAMIC_ENABLED.set(1 if dynamic_enabled else 0)
+    
+    # Per-model pricing
+    for model in pricing.get("models", []):
+        model_id = model.get("id")
+        if not model_id:
+            continue
+        
+        price_per_token = model.get("price_per_token")
+        if price_per_token is not None:
+            PRICING_MODEL_PRICE.labels(model_id=model_id).set(price_per_token)
+        
+        units_per_token = model.get("units_of_compute_per_token")
+        if units_per_token is not None:
+            PRICING_MODEL_UNITS.labels(model_id=model_id).set(units_per_token)
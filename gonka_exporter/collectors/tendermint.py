@@ -0,0 +1,235 @@
+"""
+Block height and chain status, from local Tendermint RPC or public nodes.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from prometheus_client import Gauge
+
+from gonka_exporter.config import (
+    BASE_URL,
+    BLOCK_HEIGHT_NODES,
+    CHAIN_STATUS_ENDPOINT,
+    EXPORT_NETWORK_METRICS,
+    TENDERMINT_STATUS_ENDPOINT,
+)
+from gonka_exporter.upstream import sample_upstreams, upstream_get
+
+# =============================================================================
+# PROMETHEUS METRICS
+# =============================================================================
+
+BLOCK_HEIGHT_MAX = Gauge(
+    "gonka_block_height_max",
+    "Maximum block height from 3 public Gonka nodes (network monitoring only)"
+)
+
+BLOCK_HEIGHT = Gauge(
+    "gonka_block_height",
+    "Latest block height from Tendermint RPC"
+)
+
+BLOCK_TIME = Gauge(
+    "gonka_block_time_seconds",
+    "Timestamp of latest block (seconds since epoch)"
+)
+
+EARLIEST_BLOCK_HEIGHT = Gauge(
+    "gonka_chain_earliest_block_height",
+    "Earliest block height in chain"
+)
+
+EARLIEST_BLOCK_TIME = Gauge(
+    "gonka_chain_earliest_block_time",
+    "Earliest block timestamp (seconds since epoch)"
+)
+
+CATCHING_UP = Gauge(
+    "gonka_chain_catching_up",
+    "Whether node is catching up (1) or synced (0)"
+)
+
+# =============================================================================
+# FETCH FUNCTIONS
+# =============================================================================
+
+def fetch_tendermint_status() -> Optional[Dict[str, Any]]:
+    """
+    Fetch status from local Tendermint RPC endpoint.
+    Returns parsed JSON or None on failure.
+    """
+    url = f"{BASE_URL}{TENDERMINT_STATUS_ENDPOINT}"
+    try:
+        response = upstream_get(url, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("result", {})
+    except Exception as exc:
+        print(f"[ERROR] Failed to fetch Tendermint status from {url}: {exc}")
+        return None
+
+
+def fetch_chain_status_from_node(node_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch chain status from a specific node.
+    Returns parsed JSON or None on failure.
+    """
+    url = f"{node_url}{CHAIN_STATUS_ENDPOINT}"
+    try:
+        response = upstream_get(url, timeout=5)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("result", {})
+    except Exception as exc:
+        print(f"[ERROR] Failed to fetch chain status from {url}: {exc}")
+        return None
+
+
+def fetch_max_block_height_from_nodes() -> Optional[Tuple[int, str]]:
+    """
+    Fetch block height from localhost + 5 random external nodes and return the maximum.
+    Returns (max_height, latest_time) or None if all nodes fail.
+    """
+    max_height = None
+    latest_time = None
+    
+    # Always include localhost
+    nodes_to_check = ["http://localhost:8000"]
+    
+    # Add 5 random nodes from the external list (replays reuse the recorded picks)
+    selected_external = sample_upstreams("block_height_nodes", BLOCK_HEIGHT_NODES, 5)
+    nodes_to_check.extend(selected_external)
+    
+    for node_url in nodes_to_check:
+        status = fetch_chain_status_from_node(node_url)
+        if not status:
+            continue
+        
+        sync_info = status.get("sync_info", {})
+        height_str = sync_info.get("latest_block_height")
+        time_str = sync_info.get("latest_block_time")
+        
+        if height_str:
+            try:
+                height = int(height_str)
+                if max_height is None or height > max_height:
+                    max_height = height
+                    latest_time = time_str
+            except Exception as exc:
+                print(f"[ERROR] Failed to parse block height from {node_url}: {exc}")
+    
+    if max_height is not None:
+        return max_height, latest_time
+    
+    return None
+
+# =============================================================================
+# UPDATE FUNCTIONS
+# =============================================================================
+
+def update_tendermint_metrics():
+    """
+    Update basic Tendermint blockchain metrics.
+    
+    If EXPORT_NETWORK_METRICS is enabled:
+        - Fetches block height from 3 nodes and exports as gonka_block_height_max
+        - Also fetches local block height and exports as gonka_block_height
+    Otherwise:
+        - Uses local Tendermint RPC for gonka_block_height
+    """
+    if EXPORT_NETWORK_METRICS:
+        # Network monitoring mode: check multiple nodes for max block height
+        result = fetch_max_block_height_from_nodes()
+        if result:
+            max_height, latest_time = result
+            BLOCK_HEIGHT_MAX.set(max_height)  # Export as separate metric
+            
+            if latest_time:
+                try:
+                    dt = datetime.fromisoformat(latest_time.rstrip("Z")).replace(tzinfo=timezone.utc)
+                    BLOCK_TIME.set(dt.timestamp())
+                except Exception as exc:
+                    print(f"[ERROR] Failed to parse block time: {exc}")
+        else:
+            print("[WARN] Failed to fetch block height from all nodes")
+        
+        # Also fetch LOCAL node's block height
+        local_status = fetch_tendermint_status()
+        if local_status:
+            sync_info = local_status.get("sync_info", {})
+            
+            local_height = sync_info.get("latest_block_height")
+            if local_height:
+                try:
+                    BLOCK_HEIGHT.set(int(local_height))
+                except Exception as exc:
+                    print(f"[ERROR] Failed to parse local block height: {exc}")
+            
+            catching_up = sync_info.get("catching_up", False)
+            CATCHING_UP.set(1 if catching_up else 0)
+        
+        # Also fetch enhanced metrics from first available public node
+        for node_url in BLOCK_HEIGHT_NODES:
+            status = fetch_chain_status_from_node(node_url)
+            if status:
+                sync_info = status.get("sync_info", {})
+                
+                earliest_height = sync_info.get("earliest_block_height")
+                if earliest_height:
+                    try:
+                        EARLIEST_BLOCK_HEIGHT.set(int(earliest_height))
+                    except Exception:
+                        pass
+                
+                earliest_time = sync_info.get("earliest_block_time")
+                if earliest_time:
+                    try:
+                        dt = datetime.fromisoformat(earliest_time.rstrip("Z")).replace(tzinfo=timezone.utc)
+                        EARLIEST_BLOCK_TIME.set(dt.timestamp())
+                    except Exception:
+                        pass
+                
+                break  # Got data from one node, that's enough
+    else:
+        # Local monitoring mode: use local Tendermint RPC
+        status = fetch_tendermint_status()
+        if not status:
+            return
+        
+        sync_info = status.get("sync_info", {})
+        
+        # Latest block height
+        latest_height = sync_info.get("latest_block_height")
+        if latest_height:
+            try:
+                BLOCK_HEIGHT.set(int(latest_height))
+            except Exception as exc:
+                print(f"[ERROR] Failed to parse latest_block_height: {exc}")
+        
+        # Latest block time
+        latest_time = sync_info.get("latest_block_time")
+        if latest_time:
+            try:
+                dt = datetime.fromisoformat(latest_time.rstrip("Z")).replace(tzinfo=timezone.utc)
+                BLOCK_TIME.set(dt.timestamp())
+            except Exception as exc:
+                print(f"[ERROR] Failed to parse latest_block_time: {exc}")
+        
+        # Enhanced metrics
+        earliest_height = sync_info.get("earliest_block_height")
+        if earliest_height:
+            try:
+                EARLIEST_BLOCK_HEIGHT.set(int(earliest_height))
+            except Exception:
+                pass
+        
+        earliest_time = sync_info.get("earliest_block_time")
+        if earliest_time:
+            try:
+                dt = datetime.fromisoformat(earliest_time.rstrip("Z")).replace(tzinfo=timezone.utc)
+                EARLIEST_BLOCK_TIME.set(dt.timestamp())
+            except Exception:
+                pass
+        
+        catching_up = sync_info.get("catching_up", False)
+        CATCHING_UP.set(1 if catching_up else 0)
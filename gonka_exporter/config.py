@@ -0,0 +1,120 @@
+"""
+Exporter configuration, read once from environment variables at import.
+"""
+import os
+import socket
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Base URLs
+BASE_URL = os.getenv("GONKA_BASE_URL", "http://localhost:26657").rstrip("/")
+NODE_BASE_URL = os.getenv("NODE_BASE_URL", "http://localhost:9200/admin/v1").rstrip("/")
+
+# Network API URLs in priority order (localhost first to reduce load on external nodes).
+# If the current URL has not answered within NETWORK_API_HEDGE_DELAY seconds, or
+# fails, the same request is also sent to the next URL; the first good response wins.
+NETWORK_API_URLS = [
+    u.strip().rstrip("/")
+    for u in os.getenv("NETWORK_API_URLS", "http://localhost:8000").split(",")
+    if u.strip()
+] or ["http://localhost:8000"]
+NETWORK_API_URL = NETWORK_API_URLS[0]
+NETWORK_API_HEDGE_DELAY = float(os.getenv("NETWORK_API_HEDGE_DELAY", "1.0"))
+
+# Upstream request limits (0 = unlimited).
+# UPSTREAM_REQUEST_BUDGET caps requests per collection cycle across all hosts;
+# once spent, the lowest-priority collectors are deferred to the next cycle.
+# UPSTREAM_HOST_RATE / UPSTREAM_HOST_BURST form a token bucket per upstream host.
+UPSTREAM_REQUEST_BUDGET = int(os.getenv("UPSTREAM_REQUEST_BUDGET", "0"))
+UPSTREAM_HOST_RATE = float(os.getenv("UPSTREAM_HOST_RATE", "0"))
+UPSTREAM_HOST_BURST = max(1, int(os.getenv("UPSTREAM_HOST_BURST", "10")))
+
+# Block height nodes - check multiple for reliability when doing network monitoring
+BLOCK_HEIGHT_NODES = [
+    "http://node1.gonka.ai:8000",
+    "http://node2.gonka.ai:8000",
+    "http://node3.gonka.ai:8000",
+    "http://185.216.21.98:8000",
+    "http://36.189.234.197:18026",
+    "http://36.189.234.237:17241",
+    "http://47.236.26.199:8000",
+    "http://47.236.19.22:18000",
+    "http://gonka.spv.re:8000",
+]
+
+# Feature flags
+EXPORT_NETWORK_METRICS = os.getenv("EXPORT_NETWORK_METRICS", "false").lower() in ("1", "true", "yes")
+ENABLE_NODE_FETCH = os.getenv("ENABLE_NODE_FETCH", "true").lower() in ("1", "true", "yes")
+
+# Adaptive node state polling: while any node is in POC, mid-transition or
+# intended != current, /nodes is polled every NODE_FAST_POLL_INTERVAL seconds
+# between full cycles, backing off towards REFRESH_INTERVAL once stable (0 = off)
+NODE_FAST_POLL_INTERVAL = float(os.getenv("NODE_FAST_POLL_INTERVAL", "5"))
+
+# Optional participant address for detailed stats
+PARTICIPANT_ADDRESS = os.getenv("PARTICIPANT_ADDRESS", "").strip()
+
+# Rotating detailed stats for all active participants (network mode only).
+# Each cycle refreshes at most PARTICIPANT_STATS_BATCH_SIZE participants, so
+# full coverage takes ceil(participants / batch) cycles.
+EXPORT_ALL_PARTICIPANT_STATS = os.getenv("EXPORT_ALL_PARTICIPANT_STATS", "false").lower() in ("1", "true", "yes")
+PARTICIPANT_STATS_BATCH_SIZE = max(1, int(os.getenv("PARTICIPANT_STATS_BATCH_SIZE", "20")))
+
+# Exporter settings
+EXPORTER_PORT = int(os.getenv("EXPORTER_PORT", "9401"))
+REFRESH_INTERVAL = int(os.getenv("REFRESH_INTERVAL", "30"))
+
+# Debug endpoint (cProfile / tracemalloc of collection cycles), off by default.
+# Binds to localhost unless DEBUG_BIND_ADDRESS says otherwise.
+ENABLE_DEBUG_ENDPOINT = os.getenv("ENABLE_DEBUG_ENDPOINT", "false").lower() in ("1", "true", "yes")
+DEBUG_BIND_ADDRESS = os.getenv("DEBUG_BIND_ADDRESS", "127.0.0.1")
+DEBUG_PORT = int(os.getenv("DEBUG_PORT", "9402"))
+
+# Optional push of every collection snapshot to a Prometheus remote-write
+# endpoint (PUSH_FORMAT=remote_write) or a Pushgateway (PUSH_FORMAT=pushgateway).
+# Snapshots wait in a bounded queue; when it is full the oldest is dropped.
+PUSH_URL = os.getenv("PUSH_URL", "").strip().rstrip("/")
+PUSH_FORMAT = os.getenv("PUSH_FORMAT", "remote_write").strip().lower()
+PUSH_FORMATS = ("remote_write", "pushgateway")
+if PUSH_URL and PUSH_FORMAT not in PUSH_FORMATS:
+    raise ValueError(f"PUSH_FORMAT must be one of {', '.join(PUSH_FORMATS)}, got {PUSH_FORMAT!r}")
+PUSH_JOB = os.getenv("PUSH_JOB", "gonka_exporter")
+PUSH_INSTANCE = os.getenv("PUSH_INSTANCE", socket.gethostname())
+PUSH_QUEUE_SIZE = max(1, int(os.getenv("PUSH_QUEUE_SIZE", "20")))
+PUSH_BATCH_SIZE = max(1, int(os.getenv("PUSH_BATCH_SIZE", "5")))
+PUSH_TIMEOUT = float(os.getenv("PUSH_TIMEOUT", "10"))
+PUSH_MAX_BACKOFF = float(os.getenv("PUSH_MAX_BACKOFF", "60"))
+
+# Record every upstream response to a gzipped JSON-lines archive, or replay
+# such an archive through update_metrics() with no network access.
+# REPLAY_SPEED is "max" (no sleeps) or "realtime" (recorded pacing and latency).
+RECORD_FILE = os.getenv("RECORD_FILE", "").strip()
+REPLAY_FILE = os.getenv("REPLAY_FILE", "").strip()
+REPLAY_SPEED = os.getenv("REPLAY_SPEED", "max").strip().lower()
+
+# API endpoints
+TENDERMINT_STATUS_ENDPOINT = "/status"
+PARTICIPANTS_ENDPOINT = "/v1/epochs/current/participants"
+PRICING_ENDPOINT = "/v1/pricing"
+MODELS_ENDPOINT = "/v1/models"
+CHAIN_STATUS_ENDPOINT = "/chain-rpc/status"
+PARTICIPANT_STATS_ENDPOINT = "/chain-api/productscience/inference/inference/participant"
+
+# Enum mappings
+HARDWARE_NODE_STATUS_MAP = {
+    "UNKNOWN": 0,
+    "INFERENCE": 1,
+    "POC": 2,
+    "TRAINING": 3,
+    "STOPPED": 4,
+    "FAILED": 5,
+}
+
+POC_STATUS_MAP = {
+    "IDLE": 0,
+    "GENERATING": 1,
+    "VALIDATING": 2,
+}
@@ -0,0 +1,182 @@
+"""
+Opt-in debug HTTP endpoint profiling collection cycles (ENABLE_DEBUG_ENDPOINT).
+"""
+import cProfile
+import io
+import pstats
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from gonka_exporter.config import REFRESH_INTERVAL
+
+# =============================================================================
+# DEBUG PROFILING
+# =============================================================================
+
+# Upper bound on cycles a single debug request may span
+DEBUG_MAX_CYCLES = 20
+
+
+class DebugCycleRequest:
+    """
+    A pending debug request that observes the next collection cycles.
+    kind is "profile" (cProfile) or "tracemalloc" (snapshot diff).
+    """
+    __slots__ = ("kind", "cycles", "limit", "profiler", "baseline", "started_tracemalloc", "done", "result")
+
+    def __init__(self, kind: str, cycles: int, limit: int):
+        self.kind = kind
+        self.cycles = cycles
+        self.limit = limit
+        self.profiler = None
+        self.baseline = None
+        self.started_tracemalloc = False
+        self.done = threading.Event()
+        self.result = ""
+
+
+# The active debug request, shared between the debug server and the main loop
+_debug_request: Optional[DebugCycleRequest] = None
+_debug_lock = threading.Lock()
+
+
+def begin_debug_cycle():
+    """
+    Called before each collection cycle; starts profiling if requested.
+    """
+    with _debug_lock:
+        req = _debug_request
+        if req is None or req.kind != "profile":
+            return
+        if req.profiler is None:
+            req.profiler = cProfile.Profile()
+        req.profiler.enable()
+
+
+def end_debug_cycle():
+    """
+    Called after each collection cycle; completes the debug request once
+    it has observed the requested number of cycles.
+    """
+    global _debug_request
+
+    with _debug_lock:
+        req = _debug_request
+        if req is None:
+            return
+        
+        if req.kind == "profile":
+            if req.profiler is None:
+                return
+            req.profiler.disable()
+            req.cycles -= 1
+            if req.cycles > 0:
+                return
+            out = io.StringIO()
+            stats = pstats.Stats(req.profiler, stream=out)
+            stats.sort_stats("cumulative").print_stats(req.limit)
+            req.result = out.getvalue()
+        else:
+            # First cycle boundary only takes the baseline snapshot
+            if req.baseline is None:
+                req.baseline = tracemalloc.take_snapshot()
+                return
+            req.cycles -= 1
+            if req.cycles > 0:
+                return
+            snapshot = tracemalloc.take_snapshot()
+            lines = [f"Top {req.limit} allocation differences by line:"]
+            for stat in snapshot.compare_to(req.baseline, "lineno")[:req.limit]:
+                lines.append(str(stat))
+            req.result = "\n".join(lines) + "\n"
+            if req.started_tracemalloc:
+                tracemalloc.stop()
+        
+        _debug_request = None
+        req.done.set()
+
+
+def run_debug_request(kind: str, cycles: int, limit: int) -> Tuple[int, str]:
+    """
+    Arm a debug request and block until it completes.
+    Returns (http_status, body).
+    """
+    global _debug_request
+
+    req = DebugCycleRequest(kind, cycles, limit)
+    with _debug_lock:
+        if _debug_request is not None:
+            return 409, "Another debug request is in progress\n"
+        if kind == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            req.started_tracemalloc = True
+        _debug_request = req
+    
+    # tracemalloc needs one extra cycle boundary for the baseline snapshot
+    timeout = (cycles + 1) * REFRESH_INTERVAL + 60
+    if req.done.wait(timeout):
+        return 200, req.result
+    
+    with _debug_lock:
+        if _debug_request is req:
+            if req.profiler is not None:
+                req.profiler.disable()
+            if req.started_tracemalloc:
+                tracemalloc.stop()
+            _debug_request = None
+    return 504, "Timed out waiting for collection cycles\n"
+
+
+class DebugRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves /debug/profile and /debug/tracemalloc.
+    Both accept ?cycles=N (default 1) and ?limit=N (default 30).
+    """
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        kinds = {"/debug/profile": "profile", "/debug/tracemalloc": "tracemalloc"}
+        kind = kinds.get(parsed.path)
+        if kind is None:
+            self._reply(404, "Not found. Use /debug/profile or /debug/tracemalloc\n")
+            return
+        
+        query = parse_qs(parsed.query)
+        try:
+            cycles = int(query.get("cycles", ["1"])[0])
+            limit = int(query.get("limit", ["30"])[0])
+        except ValueError:
+            self._reply(400, "cycles and limit must be integers\n")
+            return
+        if not 1 <= cycles <= DEBUG_MAX_CYCLES or limit < 1:
+            self._reply(400, f"cycles must be 1-{DEBUG_MAX_CYCLES} and limit must be positive\n")
+            return
+        
+        print(f"[INFO] Debug {kind} requested for {cycles} cycle(s) by {self.client_address[0]}")
+        status, body = run_debug_request(kind, cycles, limit)
+        self._reply(status, body)
+
+    def _reply(self, status: int, body: str):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_debug_server(address: str, port: int) -> ThreadingHTTPServer:
+    """
+    Start the debug HTTP server in a daemon thread.
+    """
+    server = ThreadingHTTPServer((address, port), DebugRequestHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
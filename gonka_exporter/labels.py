@@ -0,0 +1,37 @@
+"""
+Cache of labelled metric children shared by the collectors.
+"""
+from typing import Any, Dict, Tuple
+
+from prometheus_client import Gauge
+
+# =============================================================================
+# LABEL CHILD CACHE
+# =============================================================================
+
+# Labelled gauge children by gauge and label values, kept across cycles so
+# hot paths skip Gauge.labels() validation and locking on every set
+_label_children: Dict[Gauge, Dict[Tuple[str, ...], Any]] = {}
+
+
+def labelled(gauge: Gauge, *values: str):
+    """
+    Return the cached child of a labelled gauge for positional label values.
+    """
+    children = _label_children.setdefault(gauge, {})
+    child = children.get(values)
+    if child is None:
+        child = gauge.labels(*values)
+        children[values] = child
+    return child
+
+
+def remove_labelled(gauge: Gauge, *values: str):
+    """
+    Remove a labelled child from the gauge and the child cache, if present.
+    """
+    _label_children.get(gauge, {}).pop(values, None)
+    try:
+        gauge.remove(*values)
+    except KeyError:
+        pass
@@ -0,0 +1,317 @@
+"""
+Optional push of collection snapshots to remote write or a Pushgateway (PUSH_URL).
+"""
+import gzip
+import struct
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Tuple
+
+import requests
+from prometheus_client import Counter, Gauge, REGISTRY, generate_latest
+
+from gonka_exporter.config import (
+    PUSH_BATCH_SIZE,
+    PUSH_FORMAT,
+    PUSH_INSTANCE,
+    PUSH_JOB,
+    PUSH_MAX_BACKOFF,
+    PUSH_QUEUE_SIZE,
+    PUSH_TIMEOUT,
+    PUSH_URL,
+)
+
+# =============================================================================
+# PROMETHEUS METRICS
+# =============================================================================
+
+PUSH_QUEUE_LENGTH = Gauge(
+    "gonka_push_queue_length",
+    "Collection snapshots waiting to be pushed"
+)
+
+PUSH_SENT_SNAPSHOTS = Counter(
+    "gonka_push_sent_snapshots_total",
+    "Collection snapshots pushed successfully"
+)
+
+PUSH_DROPPED_SNAPSHOTS = Counter(
+    "gonka_push_dropped_snapshots_total",
+    "Collection snapshots dropped unsent (reason=queue_full or rejected)",
+    ["reason"]
+)
+
+PUSH_FAILURES = Counter(
+    "gonka_push_failures_total",
+    "Failed push attempts (reason=retried: retried with backoff; reason=rejected: 4xx, batch dropped)",
+    ["reason"]
+)
+
+# =============================================================================
+# PUSH PIPELINE
+# =============================================================================
+
+class PushSnapshot:
+    """
+    Samples of one collection cycle: (metric name, sorted label pairs, value),
+    all taken at timestamp_ms. Text is the exposition format, for Pushgateway.
+    """
+    __slots__ = ("timestamp_ms", "samples", "text")
+
+    def __init__(self, timestamp_ms: int, samples: List[Tuple[str, Tuple[Tuple[str, str], ...], float]], text: bytes):
+        self.timestamp_ms = timestamp_ms
+        self.samples = samples
+        self.text = text
+
+
+# Snapshots waiting to be pushed, oldest first
+_push_queue: deque = deque()
+_push_cond = threading.Condition()
+
+
+def take_push_snapshot() -> PushSnapshot:
+    """
+    Capture the current registry contents for pushing.
+    """
+    samples = []
+    text = b""
+    if PUSH_FORMAT == "pushgateway":
+        text = generate_latest(REGISTRY)
+    else:
+        for family in REGISTRY.collect():
+            for sample in family.samples:
+                # _created series only repeat process start times
+                if sample.name.endswith("_created"):
+                    continue
+                samples.append((sample.name, tuple(sorted(sample.labels.items())), sample.value))
+    return PushSnapshot(int(time.time() * 1000), samples, text)
+
+
+def enqueue_push_snapshot():
+    """
+    Queue a snapshot of this cycle, dropping the oldest if the queue is full.
+    """
+    if not PUSH_URL:
+        return
+    snapshot = take_push_snapshot()
+    with _push_cond:
+        if len(_push_queue) >= PUSH_QUEUE_SIZE:
+            _push_queue.popleft()
+            PUSH_DROPPED_SNAPSHOTS.labels(reason="queue_full").inc()
+        _push_queue.append(snapshot)
+        PUSH_QUEUE_LENGTH.set(len(_push_queue))
+        _push_cond.notify()
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _pb_bytes(field: int, data: bytes) -> bytes:
+    return _varint(field << 3 | 2) + _varint(len(data)) + data
+
+
+def encode_write_request(snapshots: List[PushSnapshot]) -> bytes:
+    """
+    Encode snapshots as a remote-write WriteRequest protobuf.
+    Each series gets job and instance labels, as a scrape would add.
+    """
+    extra = (("instance", PUSH_INSTANCE), ("job", PUSH_JOB))
+    # Encoded samples by series, each with one sample per snapshot.
+    # Sample: double value = 1 (fixed64), int64 timestamp = 2 (varint);
+    # at most 19 bytes, so its length fits in one byte.
+    series: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], bytearray] = {}
+    for snapshot in snapshots:
+        timestamp = b"\x10" + _varint(snapshot.timestamp_ms)
+        header = bytes((2 << 3 | 2, 9 + len(timestamp), 0x09))
+        for name, labels, value in snapshot.samples:
+            points = series.get((name, labels))
+            if points is None:
+                points = series[(name, labels)] = bytearray()
+            points += header
+            points += struct.pack("<d", value)
+            points += timestamp
+    
+    out = bytearray()
+    for (name, labels), points in series.items():
+        ts = bytearray()
+        for label_name, label_value in sorted((("__name__", name),) + labels + extra):
+            ts += _pb_bytes(1, _pb_bytes(1, label_name.encode()) + _pb_bytes(2, label_value.encode()))
+        ts += points
+        out += _pb_bytes(1, bytes(ts))
+    return bytes(out)
+
+
+def _snappy_compress_python(data: bytes) -> bytes:
+    """
+    Compress data in the snappy block format required by remote write.
+    Greedy 4-byte hash matching; not as tight as the C library but compatible.
+    """
+    out = bytearray(_varint(len(data)))
+    
+    def emit_literal(start: int, end: int):
+        while start < end:
+            chunk = min(end - start, 65536)
+            n = chunk - 1
+            if n < 60:
+                out.append(n << 2)
+            elif n < 0x100:
+                out.append(60 << 2)
+                out.append(n)
+            else:
+                out.append(61 << 2)
+                out.extend(struct.pack("<H", n))
+            out.extend(data[start:start + chunk])
+            start += chunk
+    
+    def emit_copy(offset: int, length: int):
+        # Copy with 2-byte offset: up to 64 bytes per element
+        while length > 0:
+            chunk = min(length, 64)
+            out.append(((chunk - 1) << 2) | 2)
+            out.extend(struct.pack("<H", offset))
+            length -= chunk
+    
+    table: Dict[bytes, int] = {}
+    literal_start = 0
+    i = 0
+    end = len(data) - 3
+    while i < end:
+        key = data[i:i + 4]
+        candidate = table.get(key)
+        table[key] = i
+        if candidate is None or i - candidate > 0xFFFF:
+            i += 1
+            continue
+        length = 4
+        while i + length < len(data) and data[candidate + length] == data[i + length]:
+            length += 1
+        emit_literal(literal_start, i)
+        emit_copy(i - candidate, length)
+        i += length
+        literal_start = i
+    emit_literal(literal_start, len(data))
+    return bytes(out)
+
+
+# Native snappy if installed: the pure-Python encoder manages only a few
+# MB/s while holding the GIL, stalling collection and scrapes meanwhile
+try:
+    import cramjam
+    
+    def snappy_compress(data: bytes) -> bytes:
+        return bytes(cramjam.snappy.compress_raw(data))
+except ImportError:
+    try:
+        import snappy
+        
+        def snappy_compress(data: bytes) -> bytes:
+            return snappy.compress(data)
+    except ImportError:
+        snappy_compress = _snappy_compress_python
+
+
+def send_push(snapshots: List[PushSnapshot]):
+    """
+    Send snapshots to PUSH_URL. Raises on failure.
+    """
+    if PUSH_FORMAT == "pushgateway":
+        # Pushgateway keeps one value per series; only the newest snapshot matters.
+        # PUT replaces the whole group for this job/instance.
+        url = f"{PUSH_URL}/metrics/job/{PUSH_JOB}/instance/{PUSH_INSTANCE}"
+        response = requests.put(
+            url,
+            data=gzip.compress(snapshots[-1].text),
+            headers={
+                "Content-Type": "text/plain; version=0.0.4; charset=utf-8",
+                "Content-Encoding": "gzip",
+            },
+            timeout=PUSH_TIMEOUT,
+        )
+    else:
+        response = requests.post(
+            PUSH_URL,
+            data=snappy_compress(encode_write_request(snapshots)),
+            headers={
+                "Content-Type": "application/x-protobuf",
+                "Content-Encoding": "snappy",
+                "X-Prometheus-Remote-Write-Version": "0.1.0",
+            },
+            timeout=PUSH_TIMEOUT,
+        )
+    response.raise_for_status()
+
+
+def _is_permanent_failure(exc: Exception) -> bool:
+    """
+    4xx responses other than 429 will fail the same way again and must not
+    be retried (remote-write spec); everything else is retried.
+    """
+    if not isinstance(exc, requests.HTTPError) or exc.response is None:
+        return False
+    status = exc.response.status_code
+    return 400 <= status < 500 and status != 429
+
+
+def _remove_batch(batch: List[PushSnapshot]) -> int:
+    """
+    Remove a finished batch from the head of the queue.
+    Returns how many of its snapshots were still queued; any others were
+    dropped (and counted) while the batch was in flight.
+    """
+    ids = {id(snapshot) for snapshot in batch}
+    removed = 0
+    with _push_cond:
+        while _push_queue and id(_push_queue[0]) in ids:
+            _push_queue.popleft()
+            removed += 1
+        PUSH_QUEUE_LENGTH.set(len(_push_queue))
+    return removed
+
+
+def push_worker():
+    """
+    Send queued snapshots in batches of up to PUSH_BATCH_SIZE, retrying
+    failures with exponential backoff and dropping batches the target
+    rejects. Runs forever in a daemon thread.
+    """
+    backoff = 1.0
+    while True:
+        with _push_cond:
+            while not _push_queue:
+                _push_cond.wait()
+            batch = [_push_queue[i] for i in range(min(PUSH_BATCH_SIZE, len(_push_queue)))]
+        
+        try:
+            send_push(batch)
+        except Exception as exc:
+            if _is_permanent_failure(exc):
+                PUSH_FAILURES.labels(reason="rejected").inc()
+                dropped = _remove_batch(batch)
+                PUSH_DROPPED_SNAPSHOTS.labels(reason="rejected").inc(dropped)
+                print(f"[ERROR] {PUSH_URL} rejected {len(batch)} snapshot(s), dropping them: {exc}")
+                backoff = 1.0
+                continue
+            PUSH_FAILURES.labels(reason="retried").inc()
+            print(f"[ERROR] Failed to push {len(batch)} snapshot(s) to {PUSH_URL}: {exc}; retrying in {backoff:.0f}s")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, PUSH_MAX_BACKOFF)
+            continue
+        
+        backoff = 1.0
+        PUSH_SENT_SNAPSHOTS.inc(_remove_batch(batch))
+
+
+def start_push_worker() -> threading.Thread:
+    """
+    Start the push worker in a daemon thread.
+    """
+    thread = threading.Thread(target=push_worker, name="push", daemon=True)
+    thread.start()
+    return thread
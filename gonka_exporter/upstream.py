@@ -0,0 +1,479 @@
+"""
+Upstream HTTP access for all collectors: request limits, record/replay
+archives and hedged network API requests.
+"""
+import gzip
+import json
+import os
+import random
+import resource
+import threading
+import time
+import zlib
+from collections import deque
+from queue import Empty, Queue
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from prometheus_client import Counter, Gauge
+
+from gonka_exporter.config import (
+    NETWORK_API_HEDGE_DELAY,
+    NETWORK_API_URL,
+    NETWORK_API_URLS,
+    REPLAY_FILE,
+    UPSTREAM_HOST_BURST,
+    UPSTREAM_HOST_RATE,
+    UPSTREAM_REQUEST_BUDGET,
+)
+
+# =============================================================================
+# PROMETHEUS METRICS - UPSTREAM REQUESTS
+# =============================================================================
+
+UPSTREAM_CYCLE_REQUESTS = Gauge(
+    "gonka_upstream_cycle_requests",
+    "Upstream requests issued during the last collection cycle"
+)
+
+# The counters below are registered only when their feature is configured,
+# so default deployments don't expose empty metric families
+
+NETWORK_API_HEDGED_REQUESTS = Counter(
+    "gonka_network_api_hedged_requests_total",
+    "Network API requests sent to a fallback URL because an earlier URL was slow or failed",
+    ["url"]
+) if len(NETWORK_API_URLS) > 1 else None
+
+UPSTREAM_THROTTLED_REQUESTS = Counter(
+    "gonka_upstream_throttled_requests_total",
+    "Upstream requests delayed by the host rate limit (reason=rate) or refused by the cycle budget (reason=budget)",
+    ["host", "reason"]
+) if UPSTREAM_HOST_RATE > 0 or UPSTREAM_REQUEST_BUDGET > 0 else None
+
+UPSTREAM_DEFERRED_COLLECTIONS = Counter(
+    "gonka_upstream_deferred_collections_total",
+    "Collectors skipped for a cycle because the upstream request budget was spent",
+    ["collector"]
+) if UPSTREAM_REQUEST_BUDGET > 0 else None
+
+# =============================================================================
+# UPSTREAM REQUEST LIMITS
+# =============================================================================
+
+class UpstreamThrottled(requests.RequestException):
+    """
+    Raised instead of sending a request that the rate limit or budget refuses.
+    """
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at rate tokens/s up to burst. Tokens may be
+    reserved ahead, in which case acquire() returns how long to wait.
+    """
+    __slots__ = ("rate", "burst", "tokens", "updated", "lock")
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, max_wait: float) -> Optional[float]:
+        """
+        Take one token. Returns seconds to wait before using it,
+        or None (nothing taken) if that would exceed max_wait.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait_for = max(0.0, (1 - self.tokens) / self.rate)
+            if wait_for > max_wait:
+                return None
+            self.tokens -= 1
+            return wait_for
+
+
+# Token bucket per upstream host (host:port)
+_host_buckets: Dict[str, TokenBucket] = {}
+
+# Requests issued so far in the current collection cycle
+_cycle_requests = 0
+_limits_lock = threading.Lock()
+
+
+def start_request_cycle():
+    """
+    Publish the last cycle's request count and reset the cycle budget.
+    """
+    global _cycle_requests
+
+    with _limits_lock:
+        UPSTREAM_CYCLE_REQUESTS.set(_cycle_requests)
+        _cycle_requests = 0
+
+
+def request_budget_remaining() -> Optional[int]:
+    """
+    Requests left in this cycle's budget, or None if unlimited.
+    """
+    if UPSTREAM_REQUEST_BUDGET <= 0:
+        return None
+    with _limits_lock:
+        return max(0, UPSTREAM_REQUEST_BUDGET - _cycle_requests)
+
+
+def acquire_request_slot(url: str, timeout: float, budgeted: bool = True):
+    """
+    Account one upstream request against the cycle budget (unless budgeted
+    is False) and host rate limit, sleeping if the host bucket is empty.
+    Raises UpstreamThrottled if refused.
+    """
+    global _cycle_requests
+
+    host = urlparse(url).netloc
+    
+    with _limits_lock:
+        if budgeted:
+            if UPSTREAM_REQUEST_BUDGET > 0 and _cycle_requests >= UPSTREAM_REQUEST_BUDGET:
+                UPSTREAM_THROTTLED_REQUESTS.labels(host=host, reason="budget").inc()
+                raise UpstreamThrottled(f"Upstream request budget of {UPSTREAM_REQUEST_BUDGET} per cycle spent")
+            _cycle_requests += 1
+        
+        bucket = None
+        if UPSTREAM_HOST_RATE > 0:
+            bucket = _host_buckets.get(host)
+            if bucket is None:
+                bucket = _host_buckets[host] = TokenBucket(UPSTREAM_HOST_RATE, UPSTREAM_HOST_BURST)
+    
+    if bucket is None:
+        return
+    
+    # Waiting longer than the request timeout would stall the cycle
+    wait_for = bucket.acquire(max_wait=timeout)
+    if wait_for is None:
+        if budgeted:
+            with _limits_lock:
+                _cycle_requests -= 1
+        UPSTREAM_THROTTLED_REQUESTS.labels(host=host, reason="rate").inc()
+        raise UpstreamThrottled(f"Rate limit for {host} exceeded")
+    if wait_for > 0:
+        UPSTREAM_THROTTLED_REQUESTS.labels(host=host, reason="rate").inc()
+        time.sleep(wait_for)
+
+# =============================================================================
+# UPSTREAM RECORD / REPLAY
+# =============================================================================
+
+# Open archive while recording, and the time recording started
+_record_stream = None
+_record_start = 0.0
+_record_lock = threading.Lock()
+
+# Recorded entries for the cycle being replayed, queued per URL
+_replay_responses: Dict[str, deque] = {}
+# Recorded sample_upstreams() picks for the cycle being replayed, by name
+_replay_samples: Dict[str, List[str]] = {}
+_replay_realtime = False
+
+
+def start_recording(path: str) -> str:
+    """
+    Start writing upstream responses to a gzipped JSON-lines archive.
+    If path exists (e.g. from before a restart), a timestamp is added to the
+    file name rather than appending to it: a killed exporter leaves its gzip
+    stream unterminated, and anything appended after it would be unreadable.
+    Returns the path actually written.
+    """
+    global _record_stream, _record_start
+
+    if os.path.exists(path):
+        directory, name = os.path.split(path)
+        stem, dot, extension = name.partition(".")
+        path = os.path.join(directory, f"{stem}-{time.strftime('%Y%m%dT%H%M%S')}{dot}{extension}")
+    _record_stream = gzip.open(path, "xt", encoding="utf-8")
+    _record_start = time.time()
+    return path
+
+
+def _record(entry: Dict[str, Any]):
+    # Hedged network API requests record from worker threads
+    with _record_lock:
+        entry["t"] = round(time.time() - _record_start, 3)
+        _record_stream.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+def record_cycle():
+    """
+    Mark the start of a collection cycle in the archive.
+    """
+    if _record_stream is None:
+        return
+    with _record_lock:
+        _record_stream.flush()
+    _record({"cycle": True})
+
+
+def upstream_get(url: str, timeout: float, budgeted: bool = True) -> requests.Response:
+    """
+    GET an upstream URL. All fetch functions go through here so requests
+    are rate limited and responses can be recorded to, or replayed from, an archive.
+    Requests made between cycles pass budgeted=False: they are still rate
+    limited per host but not charged to (or refused by) the cycle budget.
+    """
+    if REPLAY_FILE:
+        return _replay_get(url)
+    
+    acquire_request_slot(url, timeout, budgeted)
+    
+    if _record_stream is None:
+        return requests.get(url, timeout=timeout)
+    
+    started = time.time()
+    try:
+        response = requests.get(url, timeout=timeout)
+    except Exception as exc:
+        _record({"url": url, "error": str(exc), "elapsed": round(time.time() - started, 3)})
+        raise
+    _record({
+        "url": url,
+        "status": response.status_code,
+        "elapsed": round(time.time() - started, 3),
+        "body": response.content.decode("utf-8", "replace"),
+    })
+    return response
+
+
+def _replay_get(url: str) -> requests.Response:
+    queue = _replay_responses.get(url)
+    if not queue:
+        raise requests.ConnectionError(f"No recorded response for {url} in this cycle")
+    entry = queue.popleft()
+    if _replay_realtime:
+        time.sleep(entry.get("elapsed", 0))
+    if "error" in entry:
+        raise requests.ConnectionError(entry["error"])
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response._content = entry["body"].encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = url
+    return response
+
+
+def _archive_lines(path: str) -> Iterator[bytes]:
+    """
+    Yield the complete lines of a gzipped archive, stopping (with a warning)
+    where it is truncated or corrupt, e.g. after an exporter killed while
+    recording. Everything decompressible before that point is kept.
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    in_member = False
+    buffered = b""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(65536)
+            if not chunk:
+                break
+            while chunk:
+                in_member = True
+                before = decompressor.copy()
+                try:
+                    data = decompressor.decompress(chunk)
+                except zlib.error as exc:
+                    # Salvage the output up to the bad byte, then stop
+                    data = b""
+                    for i in range(len(chunk)):
+                        try:
+                            data += before.decompress(chunk[i:i + 1])
+                        except zlib.error:
+                            break
+                    lines = (buffered + data).split(b"\n")
+                    yield from lines[:-1]
+                    print(f"[WARN] Archive {path} is corrupt, replaying what was read: {exc}")
+                    return
+                lines = (buffered + data).split(b"\n")
+                buffered = lines.pop()
+                yield from lines
+                chunk = b""
+                if decompressor.eof:
+                    # Continue with the next gzip member, if any
+                    chunk = decompressor.unused_data
+                    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    in_member = False
+    if in_member or buffered:
+        print(f"[WARN] Archive {path} is truncated, replaying what was read")
+
+
+def load_archive(path: str) -> Iterator[Tuple[float, List[Dict[str, Any]]]]:
+    """
+    Read an archive lazily, one cycle of (start_offset, entries) at a time.
+    A truncated archive (exporter killed while recording) keeps the complete lines.
+    """
+    cycle = None
+    for line in _archive_lines(path):
+        entry = json.loads(line)
+        if entry.get("cycle"):
+            if cycle is not None:
+                yield cycle
+            cycle = (entry["t"], [])
+        elif cycle is not None:
+            cycle[1].append(entry)
+    if cycle is not None:
+        yield cycle
+
+
+def sample_upstreams(name: str, base_urls: List[str], k: int) -> List[str]:
+    """
+    random.sample() of upstream base URLs, recorded in the archive under name
+    so a replay queries the same upstreams as the recorded cycle.
+    """
+    if REPLAY_FILE:
+        return _replay_samples.get(name, [])
+    picked = random.sample(base_urls, min(k, len(base_urls)))
+    if _record_stream is not None:
+        _record({"sample": name, "picked": picked})
+    return picked
+
+
+def replay(path: str, realtime: bool, update_metrics: Callable[[], None]):
+    """
+    Drive update_metrics() from an archive and print throughput and memory.
+    Cycles are read one at a time, so peak RSS reflects the exporter rather
+    than the archive size.
+    Requires the same collector configuration the archive was recorded with.
+    """
+    global _replay_responses, _replay_samples, _replay_realtime
+
+    print(f"[INFO] Replaying {path} ({'realtime' if realtime else 'max'} speed)")
+    _replay_realtime = realtime
+    
+    durations = []
+    responses = 0
+    replay_start = time.time()
+    for offset, entries in load_archive(path):
+        if realtime:
+            delay = replay_start + offset - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        
+        _replay_responses = {}
+        _replay_samples = {}
+        for entry in entries:
+            if "sample" in entry:
+                _replay_samples[entry["sample"]] = entry["picked"]
+                continue
+            _replay_responses.setdefault(entry["url"], deque()).append(entry)
+            responses += 1
+        
+        started = time.perf_counter()
+        update_metrics()
+        durations.append(time.perf_counter() - started)
+    
+    if not durations:
+        print("[WARN] Archive contains no cycles")
+        return
+    total = sum(durations)
+    max_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"[INFO] Replay done: {len(durations)} cycles, {responses} responses")
+    print(f"[INFO]   cycle time: total {total:.3f}s, mean {total / len(durations) * 1000:.1f}ms, max {max(durations) * 1000:.1f}ms")
+    print(f"[INFO]   throughput: {responses / total if total else 0:.0f} responses/s")
+    print(f"[INFO]   max RSS: {max_rss_kib / 1024:.1f} MiB")
+
+# =============================================================================
+# HEDGED NETWORK API REQUESTS
+# =============================================================================
+
+# Attempts still running per network API URL, including abandoned slow ones
+# that are left to finish in the background
+_hedge_in_flight: Dict[str, int] = {}
+_hedge_lock = threading.Lock()
+
+# A URL with this many attempts still running is skipped until some finish
+NETWORK_API_MAX_IN_FLIGHT = 2
+
+
+def _get_ok(url: str, timeout: float) -> requests.Response:
+    response = upstream_get(url, timeout=timeout)
+    response.raise_for_status()
+    return response
+
+
+def _take_hedge_url(candidates: List[str], force: bool) -> Optional[str]:
+    """
+    Pop the first candidate URL below NETWORK_API_MAX_IN_FLIGHT and reserve
+    an attempt on it; saturated URLs before it are dropped. If all are
+    saturated, returns None, or with force the first candidate anyway.
+    """
+    with _hedge_lock:
+        for index, base_url in enumerate(candidates):
+            if _hedge_in_flight.get(base_url, 0) < NETWORK_API_MAX_IN_FLIGHT:
+                del candidates[:index + 1]
+                break
+        else:
+            if not force:
+                candidates.clear()
+                return None
+            base_url = candidates.pop(0)
+        _hedge_in_flight[base_url] = _hedge_in_flight.get(base_url, 0) + 1
+        return base_url
+
+
+def _hedge_attempt(base_url: str, path: str, timeout: float, results: Queue):
+    try:
+        results.put((_get_ok(f"{base_url}{path}", timeout), None))
+    except Exception as exc:
+        results.put((None, exc))
+    finally:
+        with _hedge_lock:
+            _hedge_in_flight[base_url] -= 1
+
+
+def network_api_get(path: str, timeout: float) -> requests.Response:
+    """
+    GET a path from the network API, hedging across NETWORK_API_URLS.
+    The first URL is tried alone; each time NETWORK_API_HEDGE_DELAY passes
+    without a good response, or an attempt fails, the next URL is tried too.
+    Each attempt runs in its own thread, so slow attempts left behind never
+    delay new requests; URLs already saturated with them are skipped.
+    Returns the first successful response; raises the last error if all fail.
+    """
+    if len(NETWORK_API_URLS) == 1:
+        return _get_ok(f"{NETWORK_API_URL}{path}", timeout)
+    
+    candidates = list(NETWORK_API_URLS)
+    results: Queue = Queue()
+    pending = 0
+    last_error: Optional[Exception] = None
+    
+    while True:
+        if candidates:
+            # Never leave a request with no attempt at all
+            base_url = _take_hedge_url(candidates, force=not pending)
+            if base_url is not None:
+                if base_url != NETWORK_API_URL:
+                    NETWORK_API_HEDGED_REQUESTS.labels(url=base_url).inc()
+                threading.Thread(
+                    target=_hedge_attempt,
+                    args=(base_url, path, timeout, results),
+                    name="hedge",
+                    daemon=True,
+                ).start()
+                pending += 1
+        if not pending:
+            raise last_error
+        
+        hedge_delay = NETWORK_API_HEDGE_DELAY if candidates else None
+        try:
+            response, error = results.get(timeout=hedge_delay)
+        except Empty:
+            continue
+        pending -= 1
+        if error is None:
+            # Attempts still in flight cannot be interrupted; their results are discarded
+            return response
+        last_error = error
@@ -0,0 +1,197 @@
+"""
+Stand-in push target for checking PUSH_URL without a Prometheus or Pushgateway.
+
+Accepts remote-write POSTs (snappy + protobuf, decoded here without extra
+dependencies) and Pushgateway PUTs (gzipped text format), and prints what
+arrived. --fail makes the first requests fail with the given status codes,
+to watch the exporter retry (5xx, 429) or drop (other 4xx) a batch.
+
+    python tools/push_receiver.py [--port 9091] [--fail 503,503,400] [--match gonka_block_height]
+
+Then run the exporter with e.g.
+    PUSH_URL=http://127.0.0.1:9091/api/v1/write
+    PUSH_URL=http://127.0.0.1:9091 PUSH_FORMAT=pushgateway
+"""
+import argparse
+import gzip
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Tuple
+
+# =============================================================================
+# DECODING
+# =============================================================================
+
+def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            return value, pos
+
+
+def snappy_decompress(data: bytes) -> bytes:
+    """
+    Decode a raw (unframed) snappy block, as used by remote write.
+    """
+    length, pos = read_varint(data, 0)
+    out = bytearray()
+    while pos < len(data):
+        tag = data[pos]
+        pos += 1
+        kind = tag & 3
+        if kind == 0:
+            size = tag >> 2
+            if size >= 60:
+                extra = size - 59
+                size = int.from_bytes(data[pos:pos + extra], "little")
+                pos += extra
+            size += 1
+            out += data[pos:pos + size]
+            pos += size
+            continue
+        if kind == 1:
+            size = 4 + ((tag >> 2) & 7)
+            offset = ((tag >> 5) << 8) | data[pos]
+            pos += 1
+        elif kind == 2:
+            size = (tag >> 2) + 1
+            offset = int.from_bytes(data[pos:pos + 2], "little")
+            pos += 2
+        else:
+            size = (tag >> 2) + 1
+            offset = int.from_bytes(data[pos:pos + 4], "little")
+            pos += 4
+        if offset == 0 or offset > len(out):
+            raise ValueError(f"bad snappy copy offset {offset}")
+        # Copies may overlap their own output, so go byte by byte
+        start = len(out) - offset
+        for i in range(size):
+            out.append(out[start + i])
+    if len(out) != length:
+        raise ValueError(f"snappy length mismatch: header {length}, got {len(out)}")
+    return bytes(out)
+
+
+def protobuf_fields(data: bytes) -> Iterator[Tuple[int, object]]:
+    """
+    Yield (field number, value) pairs; length-delimited values stay bytes.
+    """
+    pos = 0
+    while pos < len(data):
+        key, pos = read_varint(data, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = read_varint(data, pos)
+        elif wire_type == 1:
+            value = struct.unpack("<d", data[pos:pos + 8])[0]
+            pos += 8
+        elif wire_type == 2:
+            size, pos = read_varint(data, pos)
+            value = data[pos:pos + size]
+            pos += size
+        else:
+            raise ValueError(f"unsupported wire type {wire_type}")
+        yield field, value
+
+
+def decode_write_request(data: bytes) -> List[Tuple[Dict[str, str], List[Tuple[float, int]]]]:
+    """
+    Decode a prometheus.WriteRequest into (labels, [(value, timestamp_ms)]).
+    """
+    series = []
+    for field, timeseries in protobuf_fields(data):
+        if field != 1:
+            continue
+        labels = {}
+        samples = []
+        for ts_field, value in protobuf_fields(timeseries):
+            if ts_field == 1:
+                label = dict(protobuf_fields(value))
+                labels[label.get(1, b"").decode()] = label.get(2, b"").decode()
+            elif ts_field == 2:
+                sample = dict(protobuf_fields(value))
+                samples.append((sample.get(1, 0.0), sample.get(2, 0)))
+        series.append((labels, samples))
+    return series
+
+# =============================================================================
+# HTTP SERVER
+# =============================================================================
+
+class PushReceiverHandler(BaseHTTPRequestHandler):
+    fail_codes: List[int] = []
+    match = ""
+    lock = threading.Lock()
+
+    def handle_push(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.lock:
+            status = self.fail_codes.pop(0) if self.fail_codes else 204
+        if status >= 300:
+            print(f"{self.command} {self.path}: {len(body)} bytes, answering {status}")
+            self.send_response(status)
+            self.end_headers()
+            return
+
+        try:
+            if self.headers.get("Content-Encoding") == "snappy":
+                self.print_write_request(body)
+            else:
+                self.print_text(body)
+        except Exception as exc:
+            print(f"{self.command} {self.path}: could not decode: {exc}")
+            self.send_response(400)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.end_headers()
+
+    do_POST = handle_push
+    do_PUT = handle_push
+
+    def print_write_request(self, body: bytes):
+        series = decode_write_request(snappy_decompress(body))
+        samples = sum(len(s) for _, s in series)
+        timestamps = sorted({ts for _, s in series for _, ts in s})
+        print(f"{self.command} {self.path}: remote write, {len(series)} series, {samples} samples, {len(timestamps)} snapshot(s)")
+        for labels, points in series:
+            if self.match and labels.get("__name__") != self.match:
+                continue
+            print(f"  {labels} {points}")
+
+    def print_text(self, body: bytes):
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        lines = [line for line in body.decode().splitlines() if line and not line.startswith("#")]
+        print(f"{self.command} {self.path}: text format, {len(lines)} samples")
+        for line in lines:
+            if self.match and line.split("{")[0].split(" ")[0] != self.match:
+                continue
+            print(f"  {line}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bind", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9091)
+    parser.add_argument("--fail", default="", help="comma-separated status codes for the first requests")
+    parser.add_argument("--match", default="", help="only print samples of this metric name")
+    args = parser.parse_args()
+
+    PushReceiverHandler.fail_codes = [int(code) for code in args.fail.split(",") if code]
+    PushReceiverHandler.match = args.match
+    server = ThreadingHTTPServer((args.bind, args.port), PushReceiverHandler)
+    print(f"Listening on {args.bind}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()